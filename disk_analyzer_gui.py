@@ -9,10 +9,16 @@ import os
 import sys
 import json
 import threading
+import queue
+import heapq
 import time
+from array import array
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
+from stat import S_ISDIR, S_ISREG
 import subprocess
+from types import SimpleNamespace
 
 # Try to import tkinter, fall back to terminal UI if not available
 try:
@@ -25,6 +31,133 @@ except ImportError:
     print("Falling back to terminal mode...")
 
 
+# statx() flags: don't follow symlinks, and let network filesystems answer from cached attributes
+AT_FDCWD = -100
+AT_SYMLINK_NOFOLLOW = 0x100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x1
+STATX_SIZE = 0x200
+
+
+def _load_statx():
+    """Return (statx, buffer type) using libc's statx on Linux, or (None, None) if unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None, None
+    
+    try:
+        import ctypes
+        libc_statx = ctypes.CDLL(None, use_errno=True).statx
+    except (ImportError, OSError, AttributeError):
+        return None, None
+    
+    class StatxBuf(ctypes.Structure):
+        """Leading fields of struct statx, padded to its full 256 bytes"""
+        _fields_ = [
+            ('stx_mask', ctypes.c_uint32),
+            ('stx_blksize', ctypes.c_uint32),
+            ('stx_attributes', ctypes.c_uint64),
+            ('stx_nlink', ctypes.c_uint32),
+            ('stx_uid', ctypes.c_uint32),
+            ('stx_gid', ctypes.c_uint32),
+            ('stx_mode', ctypes.c_uint16),
+            ('stx_spare0', ctypes.c_uint16),
+            ('stx_ino', ctypes.c_uint64),
+            ('stx_size', ctypes.c_uint64),
+            ('stx_rest', ctypes.c_uint8 * 208),
+        ]
+    
+    libc_statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(StatxBuf)]
+    libc_statx.restype = ctypes.c_int
+    
+    def statx(path, buf):
+        """Fill buf with the type and size of path without following symlinks"""
+        if libc_statx(AT_FDCWD, os.fsencode(path), AT_SYMLINK_NOFOLLOW | AT_STATX_DONT_SYNC,
+                      STATX_TYPE | STATX_SIZE, buf):
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return buf
+    
+    # Older kernels and some sandboxes reject the call outright
+    try:
+        statx('/', StatxBuf())
+    except OSError:
+        return None, None
+    
+    return statx, StatxBuf
+
+
+_statx, _StatxBuf = _load_statx()
+
+# Filesystems where a synced stat() costs a server round trip
+NETWORK_FS_TYPES = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', 'ceph', '9p', 'glusterfs', 'lustre'}
+
+
+def _is_network_fs(path):
+    """True if path lives on a network or FUSE mount (Linux only)"""
+    try:
+        with open('/proc/self/mounts') as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    
+    path = os.path.realpath(path)
+    best, fstype = '', ''
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        if (path == mount_point or path.startswith(mount_point.rstrip('/') + '/')) and len(mount_point) > len(best):
+            best, fstype = mount_point, mount_type
+    return fstype in NETWORK_FS_TYPES or fstype.startswith('fuse')
+
+
+# Category indices, used for per-category arrays
+CAT_VIDEO, CAT_IMAGE, CAT_PDF, CAT_DOCUMENT, CAT_ARCHIVE, CAT_AUDIO, CAT_CODE, CAT_OTHER, CAT_FOLDER = range(9)
+CATEGORY_NAMES = ('video', 'image', 'pdf', 'document', 'archive', 'audio', 'code', 'other', 'folder')
+CATEGORY_INDEX = {name: i for i, name in enumerate(CATEGORY_NAMES)}
+
+CATEGORY_COLORS = {
+    'video': '#E91E63',
+    'image': '#2196F3',
+    'pdf': '#f44336',
+    'document': '#4CAF50',
+    'archive': '#FF9800',
+    'audio': '#9C27B0',
+    'code': '#00BCD4',
+    'other': '#757575'
+}
+
+# Number of largest files/folders tracked while scanning
+TOP_K = 1000
+
+
+def _accumulate(sizes, cat_indices, cat_totals):
+    """Add each size to its category slot in cat_totals"""
+    for size, cat in zip(sizes, cat_indices):
+        cat_totals[cat] += size
+    return cat_totals
+
+
+def _push_top(heap, entry):
+    """Keep the TOP_K largest entries (ordered by their leading size) in a min-heap"""
+    if len(heap) < TOP_K:
+        heapq.heappush(heap, entry)
+    elif entry[0] > heap[0][0]:
+        heapq.heapreplace(heap, entry)
+
+
+class _DirNode:
+    """Directory queued for scanning; its size rolls up into the parent once all subdirectories finish"""
+    
+    __slots__ = ('path', 'name', 'depth', 'parent', 'size', 'remaining')
+    
+    def __init__(self, path, name, depth, parent):
+        self.path = path
+        self.name = name
+        self.depth = depth
+        self.parent = parent
+        self.size = 0
+        self.remaining = 1
+    
+
 class DiskAnalyzer:
     """High-performance disk analyzer core"""
     
@@ -38,16 +171,37 @@ class DiskAnalyzer:
             'audio': {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.opus'},
             'code': {'.py', '.js', '.java', '.cpp', '.c', '.h', '.sh', '.rb', '.go', '.rs', '.php', '.html', '.css'},
         }
+        # Keyed without the leading dot to match str.rpartition('.')
+        self._ext_to_cat = {ext[1:]: cat for cat, exts in self.file_categories.items() for ext in exts}
+        self._ext_to_idx = {ext: CATEGORY_INDEX[cat] for ext, cat in self._ext_to_cat.items()}
         self.cancel_flag = False
         self.current_results = {
             'total_size': 0,
             'file_count': 0,
             'dir_count': 0,
-            'categories': defaultdict(int),
-            'largest_files': [],
-            'largest_dirs': [],
-            'all_items': []
+            'categories': array('q', [0] * len(CATEGORY_NAMES)),
         }
+        self._reset_items()
+        
+        # Guards current_results while scanning and the snapshot passed to update_callback
+        self.results_lock = threading.Lock()
+        self._snapshot = SimpleNamespace(
+            total_size=0,
+            file_count=0,
+            dir_count=0,
+            categories_arr=array('q', [0] * len(CATEGORY_NAMES)),
+            current_file=''
+        )
+        
+    def _reset_items(self):
+        """Start empty top-K heaps and folder arrays (sizes first: readers size off it)"""
+        # Only the TOP_K largest files are kept, as (size, -seq, path, category index)
+        self._top_files_heap = []
+        # Every folder is kept; this heap holds (size, -index) into the folder arrays
+        self._top_dirs_heap = []
+        self.folder_sizes = array('q')
+        self.folder_paths = []
+        self.folder_names = []
         
     def format_bytes(self, bytes_val):
         """Convert bytes to human-readable format"""
@@ -57,116 +211,287 @@ class DiskAnalyzer:
             bytes_val /= 1024.0
         return f"{bytes_val:.2f} PB"
     
-    def get_category(self, filepath):
+    def largest_size(self):
+        """Size of the largest file or folder found (None if none)"""
+        return max((max(heap)[0] for heap in (self._top_files_heap, self._top_dirs_heap) if heap), default=None)
+    
+    def get_category(self, filename):
         """Determine file category based on extension"""
-        ext = Path(filepath).suffix.lower()
-        for category, extensions in self.file_categories.items():
-            if ext in extensions:
-                return category
-        return 'other'
-    
-    def scan_directory(self, root_path, progress_callback=None, update_callback=None, max_depth=None):
-        """Scan directory and build analysis data with real-time updates"""
+        stem, _, ext = filename.rpartition('.')
+        if not stem:
+            return 'other'
+        return self._ext_to_cat.get(ext.lower(), 'other')
+    
+    def scan_directory(self, root_path, progress_callback=None, update_callback=None, max_depth=None, workers=None,
+                       use_statx=None):
+        """Scan directory and build analysis data with real-time updates
+        
+        workers sets the number of scanning threads (default: 4 per CPU, at most 32);
+        workers=1 walks the tree on the calling thread without a pool.
+        use_statx reads file sizes with statx(AT_STATX_DONT_SYNC) on Linux; by default
+        only when root_path is on a network or FUSE mount, where it skips attribute syncs.
+        """
         self.cancel_flag = False
         self.current_results = {
             'total_size': 0,
             'file_count': 0,
             'dir_count': 0,
-            'categories': defaultdict(int),
-            'largest_files': [],
-            'largest_dirs': [],
-            'all_items': []
+            'categories': array('q', [0] * len(CATEGORY_NAMES)),
         }
-        
-        dir_sizes = {}
-        update_counter = 0
-        
-        def scan_recursive(path, depth=0):
-            nonlocal update_counter
+        self._reset_items()
+        self._snapshot.current_file = ''
+        
+        if use_statx is None:
+            use_statx = _statx is not None and _is_network_fs(root_path)
+        statx = _statx if use_statx else None
+        
+        last_update = time.monotonic()
+        results = self.current_results
+        lock = self.results_lock
+        report_lock = threading.Lock()
+        work = queue.Queue()
+        errors = []
+        
+        def complete(node, size):
+            """Add size to node and roll finished directories up to their parents (lock held)"""
+            while node is not None:
+                node.size += size
+                node.remaining -= 1
+                if node.remaining:
+                    break
+                
+                if node.parent is not None:
+                    # Add directory to results
+                    self.folder_paths.append(node.path)
+                    self.folder_names.append(node.name)
+                    self.folder_sizes.append(node.size)
+                    _push_top(self._top_dirs_heap, (node.size, 1 - len(self.folder_sizes)))
+                    
+                size = node.size
+                node = node.parent
+        
+        def fill_snapshot():
+            """Copy the running totals into the reused snapshot (lock held)"""
+            snap = self._snapshot
+            snap.total_size = results['total_size']
+            snap.file_count = results['file_count']
+            snap.dir_count = results['dir_count']
+            snap.categories_arr[:] = results['categories']
+            return snap
+        
+        def scan_one(node):
+            """List one directory, flush its files under the lock and return its subdirectories"""
+            nonlocal last_update
             
             if self.cancel_flag:
-                return 0
-                
-            if max_depth and depth > max_depth:
-                return 0
-                
+                return []
+            
+            ext_to_idx = self._ext_to_idx
+            other = CAT_OTHER
+            statx_buf = _StatxBuf() if statx else None
+            file_sizes = []
+            file_paths = []
+            file_cats = []
+            subdirs = []
             total_size = 0
+            listed = False
             
-            try:
-                items = list(Path(path).iterdir())
-                self.current_results['dir_count'] += 1
-                
-                for item in items:
-                    if self.cancel_flag:
-                        return total_size
-                        
-                    try:
-                        if item.is_symlink():
-                            continue
-                            
-                        if item.is_file():
-                            size = item.stat().st_size
-                            total_size += size
-                            self.current_results['file_count'] += 1
-                            self.current_results['total_size'] += size
-                            
-                            # Categorize
-                            category = self.get_category(item)
-                            self.current_results['categories'][category] += size
-                            
-                            # Store file info
-                            file_info = {
-                                'path': str(item),
-                                'name': item.name,
-                                'size': size,
-                                'type': 'file',
-                                'category': category
-                            }
-                            self.current_results['all_items'].append(file_info)
+            if not (max_depth and node.depth > max_depth):
+                try:
+                    with os.scandir(node.path) as it:
+                        entries = list(it)
+                    listed = True
+                    
+                    for entry in entries:
+                        if self.cancel_flag:
+                            return []
                             
-                            # Real-time update every 50 items
-                            update_counter += 1
-                            if update_counter % 50 == 0 and update_callback:
-                                update_callback(self.current_results.copy())
+                        try:
+                            # One lstat gives both type and size; symlinks are neither file nor dir
+                            if statx:
+                                st = statx(entry.path, statx_buf)
+                                mode, size = st.stx_mode, st.stx_size
+                            else:
+                                st = entry.stat(follow_symlinks=False)
+                                mode, size = st.st_mode, st.st_size
                             
-                            if progress_callback:
-                                progress_callback(self.current_results['file_count'], str(item))
+                            if S_ISREG(mode):
+                                total_size += size
                                 
-                        elif item.is_dir():
-                            dir_size = scan_recursive(item, depth + 1)
-                            total_size += dir_size
-                            dir_sizes[str(item)] = dir_size
-                            
-                            # Add directory to results
-                            dir_info = {
-                                'path': str(item),
-                                'name': item.name,
-                                'size': dir_size,
-                                'type': 'folder',
-                                'category': 'folder'
-                            }
-                            self.current_results['all_items'].append(dir_info)
-                            
-                            # Update after each directory
-                            if update_callback:
-                                update_callback(self.current_results.copy())
+                                # Store file info, categorized by extension (get_category inlined)
+                                stem, _, ext = entry.name.rpartition('.')
+                                file_sizes.append(size)
+                                file_paths.append(entry.path)
+                                file_cats.append(ext_to_idx.get(ext.lower(), other) if stem else other)
+                                
+                            elif S_ISDIR(mode):
+                                subdirs.append(_DirNode(entry.path, entry.name, node.depth + 1, node))
+                                
+                        except (PermissionError, OSError):
+                            continue
                             
-                    except (PermissionError, OSError):
-                        continue
-                        
-            except (PermissionError, OSError):
-                pass
+                except (PermissionError, OSError):
+                    pass
+            
+            # Flush this directory's totals in one go
+            cat_totals = _accumulate(file_sizes, file_cats, [0] * len(CATEGORY_NAMES))
+            with lock:
+                if listed:
+                    results['dir_count'] += 1
+                results['file_count'] += len(file_sizes)
+                results['total_size'] += total_size
+                categories = results['categories']
+                for i, size in enumerate(cat_totals):
+                    categories[i] += size
+                
+                # Only files that make the top-K heap keep a record (-seq keeps scan order on ties)
+                seq = len(file_sizes) - results['file_count']
+                top_files = self._top_files_heap
+                for size, path, cat in zip(file_sizes, file_paths, file_cats):
+                    _push_top(top_files, (size, seq, path, cat))
+                    seq -= 1
+                
+                node.remaining += len(subdirs)
+                complete(node, total_size)
                 
-            return total_size
+                # Real-time update at most twice per second
+                now = time.monotonic()
+                should_update = now - last_update > 0.5
+                if should_update:
+                    last_update = now
+                    snap = fill_snapshot()
+                    file_count = snap.file_count
+                    if file_paths:
+                        snap.current_file = file_paths[-1]
+                
+            # Only one worker reports at a time; the others just carry on
+            if should_update and report_lock.acquire(blocking=False):
+                try:
+                    if update_callback:
+                        update_callback(snap)
+                    if file_paths and progress_callback:
+                        progress_callback(file_count, file_paths[-1])
+                finally:
+                    report_lock.release()
+            
+            return subdirs
+        
+        def walk(node, share=None):
+            """Scan node's subtree depth-first, handing wide directories to share if given"""
+            stack = [node]
+            while stack:
+                subdirs = scan_one(stack.pop())
+                if share and len(subdirs) > 4:
+                    for subdir in subdirs:
+                        share(subdir)
+                else:
+                    stack.extend(subdirs)
+        
+        def worker():
+            while True:
+                node = work.get()
+                try:
+                    if node is None:
+                        return
+                    if not errors:
+                        # Small directories are walked inline, wide ones are shared
+                        walk(node, work.put)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    work.task_done()
         
         # Start scanning
-        scan_recursive(root_path)
+        root = _DirNode(root_path, os.path.basename(root_path), 0, None)
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) * 4)
+        
+        if workers <= 1:
+            walk(root)
+        else:
+            # Daemon threads, so closing the app mid-scan doesn't wait for the walk to finish
+            threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+            for thread in threads:
+                thread.start()
+            work.put(root)
+            work.join()
+            for _ in range(workers):
+                work.put(None)
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise errors[0]
         
         # Final update
         if update_callback:
-            update_callback(self.current_results.copy())
+            with lock:
+                snap = fill_snapshot()
+            update_callback(snap)
         
         return self.current_results
+    
+    def select_items(self, filter_type='all', sort='size', limit=1000):
+        """Return (items, total): records for the first limit matches and the match count
+        
+        Only the TOP_K largest files and folders are ranked, so limit may not exceed TOP_K.
+        """
+        if limit > TOP_K:
+            raise ValueError(f"limit must be at most {TOP_K}")
+        
+        # Read sizes last: it is appended after the other folder arrays under the scan lock
+        paths, names, sizes = self.folder_paths, self.folder_names, self.folder_sizes
+        folder_count = len(sizes)
+        top_files = list(self._top_files_heap)
+        
+        def file_row(entry):
+            size, _, path, cat = entry
+            return {
+                'path': path,
+                'name': os.path.basename(path),
+                'size': size,
+                'type': 'file',
+                'category': CATEGORY_NAMES[cat]
+            }
+        
+        def folder_row(i):
+            return {
+                'path': paths[i],
+                'name': names[i],
+                'size': sizes[i],
+                'type': 'folder',
+                'category': 'folder'
+            }
+        
+        file_rows = []
+        folder_rows = []
+        total = 0
+        
+        if sort == 'name':
+            def key(row):
+                return row['name'].lower()
+            if filter_type != 'folders':
+                file_rows = sorted(map(file_row, top_files), key=key)
+            if filter_type != 'files':
+                indices = sorted(range(folder_count), key=lambda i: names[i].lower())
+                folder_rows = map(folder_row, indices)
+            rows = heapq.merge(file_rows, folder_rows, key=key)
+        else:
+            if filter_type != 'folders':
+                file_rows = map(file_row, sorted(top_files, reverse=True))
+            if filter_type != 'files':
+                indices = [-neg_idx for _, neg_idx in sorted(self._top_dirs_heap, reverse=True)]
+                indices = [i for i in indices if i < folder_count]
+                folder_rows = map(folder_row, indices)
+            rows = heapq.merge(file_rows, folder_rows, key=itemgetter('size'), reverse=True)
+        
+        if filter_type != 'folders':
+            total += self.current_results['file_count']
+        if filter_type != 'files':
+            total += folder_count
+        
+        # Only the rows actually shown get a dict
+        return list(islice(rows, limit)), total
 
 
 class DiskAnalyzerGUI:
@@ -181,6 +506,27 @@ class DiskAnalyzerGUI:
         self.current_results = None
         self.scanning = False
         
+        # Category draw order, re-sorted only when the totals change
+        self._cat_values = None
+        self._cat_order = []
+        
+        # Chart canvas items by category index, and which are currently shown
+        self._bar_ids = {}
+        self._pie_ids = {}
+        self._legend_ids = {}
+        self._bars_shown = set()
+        self._pie_shown = set()
+        self._legend_shown = set()
+        
+        # Rows currently in the table: path -> iid, and iid -> values
+        self._displayed_iids = {}
+        self._row_state = {}
+        
+        # The scanner only flags a fresh snapshot; a Tk timer pulls it at its own pace
+        self._snapshot = None
+        self._snapshot_ready = threading.Event()
+        self._drain_job = None
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -189,6 +535,7 @@ class DiskAnalyzerGUI:
         # Style
         style = ttk.Style()
         style.theme_use('clam')
+        self.colors_by_idx = [CATEGORY_COLORS.get(name, '#757575') for name in CATEGORY_NAMES]
         
         # Main container
         main_frame = ttk.Frame(self.root, padding="10")
@@ -262,6 +609,10 @@ class DiskAnalyzerGUI:
         self.category_canvas = tk.Canvas(cat_frame, height=200, bg='white')
         self.category_canvas.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
+        # Track the canvas width here instead of querying it on every redraw
+        self._cat_w = 600
+        self.category_canvas.bind('<Configure>', lambda e: setattr(self, '_cat_w', e.width))
+        
         # Pie chart on right
         pie_frame = ttk.Frame(viz_frame)
         pie_frame.grid(row=0, column=1, sticky=(tk.N, tk.S))
@@ -269,6 +620,7 @@ class DiskAnalyzerGUI:
         ttk.Label(pie_frame, text="Storage Distribution", font=('Arial', 10, 'bold')).grid(row=0, column=0, pady=(0, 5))
         self.pie_canvas = tk.Canvas(pie_frame, width=250, height=250, bg='white')
         self.pie_canvas.grid(row=1, column=0)
+        self.create_chart_items()
         
         # Filter Panel
         filter_frame = ttk.Frame(main_frame)
@@ -311,11 +663,11 @@ class DiskAnalyzerGUI:
         self.tree.column('Path', width=400)
         
         # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
         
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.tree_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         table_frame.columnconfigure(0, weight=1)
         table_frame.rowconfigure(0, weight=1)
         
@@ -336,11 +688,6 @@ class DiskAnalyzerGUI:
         if path:
             self.path_var.set(path)
     
-    def progress_callback(self, file_count, current_file):
-        """Update progress during scan"""
-        self.progress_var.set(f"Scanning... {file_count} files found - {Path(current_file).name}")
-        self.root.update_idletasks()
-    
     def start_scan(self):
         """Start directory scan in background thread"""
         if self.scanning:
@@ -355,10 +702,14 @@ class DiskAnalyzerGUI:
         self.scan_btn.config(state='disabled')
         self.cancel_btn.config(state='normal')
         self.progress_bar.start(10)
-        self.tree.delete(*self.tree.get_children())
+        self.clear_table()
         
         # Clear current results
         self.current_results = None
+        self._snapshot_ready.clear()
+        if self._drain_job:
+            self.root.after_cancel(self._drain_job)
+        self._drain_job = self.root.after(500, self._drain_snapshot)
         
         # Get max depth
         depth_str = self.depth_var.get()
@@ -369,7 +720,6 @@ class DiskAnalyzerGUI:
             try:
                 self.current_results = self.analyzer.scan_directory(
                     path, 
-                    progress_callback=self.progress_callback,
                     update_callback=self.realtime_update,
                     max_depth=max_depth
                 )
@@ -379,28 +729,50 @@ class DiskAnalyzerGUI:
         
         threading.Thread(target=scan_thread, daemon=True).start()
     
-    def realtime_update(self, results):
-        """Handle real-time updates during scanning"""
-        def update_ui():
-            # Update stats
+    def realtime_update(self, snapshot):
+        """Flag a fresh snapshot (called from scanning threads)"""
+        self._snapshot = snapshot
+        self._snapshot_ready.set()
+    
+    def _drain_snapshot(self):
+        """Redraw from the latest snapshot if it changed, then check again in 500ms"""
+        self._drain_job = None
+        if not self.scanning:
+            return
+        
+        if self._snapshot_ready.is_set():
+            self._snapshot_ready.clear()
+            snapshot = self._snapshot
+            
+            # The scanner refills the same snapshot in place, so read it under its lock
+            with self.analyzer.results_lock:
+                total_size = snapshot.total_size
+                file_count = snapshot.file_count
+                dir_count = snapshot.dir_count
+                categories = array('q', snapshot.categories_arr)
+                current_file = snapshot.current_file
+            
+            # Update progress and stats
+            if current_file:
+                self.progress_var.set(f"Scanning... {file_count} files found - {Path(current_file).name}")
             self.stats_labels['total_size'].config(
-                text=self.analyzer.format_bytes(results['total_size']))
+                text=self.analyzer.format_bytes(total_size))
             self.stats_labels['files'].config(
-                text=f"{results['file_count']:,}")
+                text=f"{file_count:,}")
             self.stats_labels['folders'].config(
-                text=f"{results['dir_count']:,}")
+                text=f"{dir_count:,}")
             
-            # Update visualizations
+            # Update visualizations (only existing canvas items are moved)
+            results = {'total_size': total_size, 'categories': categories}
             self.draw_categories(results)
             self.draw_pie_chart(results)
             
             # Update table with top items (limit to avoid slowdown)
-            self.update_table_realtime(results)
+            self.update_table_realtime()
         
-        # Schedule UI update in main thread
-        self.root.after(0, update_ui)
+        self._drain_job = self.root.after(500, self._drain_snapshot)
     
-    def update_table_realtime(self, results):
+    def update_table_realtime(self):
         """Update table with current results during scan"""
         # Only update every few seconds to avoid slowdown
         current_time = time.time()
@@ -414,26 +786,62 @@ class DiskAnalyzerGUI:
         
         # Get filter settings
         filter_type = self.filter_var.get()
-        items = results['all_items'].copy()
-        
-        if filter_type == 'files':
-            items = [x for x in items if x['type'] == 'file']
-        elif filter_type == 'folders':
-            items = [x for x in items if x['type'] == 'folder']
         
         # Sort by size
-        items = sorted(items, key=lambda x: x['size'], reverse=True)[:100]  # Top 100 only during scan
+        items, _ = self.analyzer.select_items(filter_type, 'size', 100)  # Top 100 only during scan
         
-        # Clear and repopulate
+        self.sync_table(items)
+    
+    def row_values(self, item):
+        """Table column values for an item record"""
+        type_str = item.get('category', item['type']).capitalize()
+        return (
+            item['name'],
+            type_str,
+            self.analyzer.format_bytes(item['size']),
+            item['path']
+        )
+    
+    def clear_table(self):
+        """Remove all rows from the table"""
         self.tree.delete(*self.tree.get_children())
-        for i, item in enumerate(items, 1):
-            type_str = item.get('category', item['type']).capitalize()
-            self.tree.insert('', 'end', text=str(i), values=(
-                item['name'],
-                type_str,
-                self.analyzer.format_bytes(item['size']),
-                item['path']
-            ))
+        self._displayed_iids.clear()
+        self._row_state.clear()
+    
+    def sync_table(self, items):
+        """Show items in the table, only touching rows that were added, dropped, moved or changed
+        
+        Rows are left unnumbered: a rank in the # column would change for every row below
+        each insert or removal. apply_filter numbers them once the scan completes.
+        """
+        rows = self._displayed_iids
+        state = self._row_state
+        
+        # Drop rows that are no longer listed
+        wanted = {item['path'] for item in items}
+        gone = [rows.pop(path) for path in list(rows) if path not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del state[iid]
+        
+        order = list(self.tree.get_children())
+        for index, item in enumerate(items):
+            values = self.row_values(item)
+            iid = rows.get(item['path'])
+            
+            if iid is None:
+                iid = self.tree.insert('', index, values=values)
+                rows[item['path']] = iid
+                order.insert(index, iid)
+            else:
+                if order[index] != iid:
+                    self.tree.move(iid, '', index)
+                    order.remove(iid)
+                    order.insert(index, iid)
+                if state[iid] != values:
+                    self.tree.item(iid, values=values)
+            state[iid] = values
     
     def cancel_scan(self):
         """Cancel ongoing scan"""
@@ -477,10 +885,10 @@ class DiskAnalyzerGUI:
         self.stats_labels['folders'].config(
             text=f"{self.current_results['dir_count']:,}")
         
-        if self.current_results['all_items']:
-            largest = max(self.current_results['all_items'], key=lambda x: x['size'])
+        largest = self.analyzer.largest_size()
+        if largest is not None:
             self.stats_labels['largest'].config(
-                text=self.analyzer.format_bytes(largest['size']))
+                text=self.analyzer.format_bytes(largest))
         
         # Update categories and pie chart
         self.draw_categories(self.current_results)
@@ -491,197 +899,173 @@ class DiskAnalyzerGUI:
         
         self.status_var.set(f"Found {self.current_results['file_count']:,} files in {self.current_results['dir_count']:,} folders")
     
+    def category_order(self, categories):
+        """Category indices by descending size, re-sorted only when the totals change"""
+        if categories != self._cat_values:
+            self._cat_values = array('q', categories)
+            self._cat_order = sorted(range(len(categories)), key=categories.__getitem__, reverse=True)
+        return self._cat_order
+    
+    def create_chart_items(self):
+        """Create every bar, slice and legend item once, hidden; redraws only move and restyle them"""
+        for i, category in enumerate(CATEGORY_NAMES):
+            color = self.colors_by_idx[i]
+            self._bar_ids[i] = (
+                self.category_canvas.create_rectangle(
+                    0, 0, 0, 0, fill=color, outline=color, state='hidden'),
+                self.category_canvas.create_text(
+                    0, 0, anchor=tk.W, font=('Arial', 9), state='hidden'),
+                self.category_canvas.create_text(
+                    0, 0, text=category.capitalize(), anchor=tk.W,
+                    font=('Arial', 9, 'bold'), state='hidden'),
+            )
+            self._pie_ids[i] = (self.pie_canvas.create_arc(
+                45, 45, 205, 205, start=0, extent=0,
+                fill=color, outline='white', width=2, state='hidden'),)
+            self._legend_ids[i] = (
+                self.pie_canvas.create_rectangle(
+                    0, 0, 0, 0, fill=color, outline=color, state='hidden'),
+                self.pie_canvas.create_text(
+                    0, 0, anchor=tk.W, font=('Arial', 8), state='hidden'),
+            )
+    
+    def show_chart_items(self, canvas, item_ids, shown, visible):
+        """Switch canvas items between shown and hidden, touching only those whose state changes"""
+        for i in shown.symmetric_difference(visible):
+            state = 'normal' if i in visible else 'hidden'
+            for item in item_ids[i]:
+                canvas.itemconfig(item, state=state)
+        shown.clear()
+        shown.update(visible)
+    
     def draw_categories(self, results=None):
         """Draw category breakdown chart"""
-        self.category_canvas.delete("all")
+        canvas = self.category_canvas
+        visible = set()
         
         if not results:
             results = self.current_results
         
-        if not results or results['total_size'] == 0:
-            return
-        
-        categories = results['categories']
-        total = results['total_size']
-        
-        colors = {
-            'video': '#E91E63',
-            'image': '#2196F3',
-            'pdf': '#f44336',
-            'document': '#4CAF50',
-            'archive': '#FF9800',
-            'audio': '#9C27B0',
-            'code': '#00BCD4',
-            'other': '#757575'
-        }
-        
-        width = self.category_canvas.winfo_width()
-        if width <= 1:
-            width = 600
-        
-        y_offset = 10
-        bar_height = 20
-        
-        sorted_cats = sorted(categories.items(), key=lambda x: x[1], reverse=True)
-        
-        for category, size in sorted_cats:
-            if size == 0:
-                continue
-            percentage = (size / total) * 100
-            bar_width = (size / total) * (width - 250)
+        if results and results['total_size']:
+            categories = results['categories']
+            total = results['total_size']
             
-            # Draw bar
-            color = colors.get(category, '#757575')
-            self.category_canvas.create_rectangle(
-                100, y_offset, 100 + bar_width, y_offset + bar_height,
-                fill=color, outline=color
-            )
+            width = self._cat_w
             
-            # Draw label
-            self.category_canvas.create_text(
-                5, y_offset + bar_height/2,
-                text=category.capitalize(),
-                anchor=tk.W,
-                font=('Arial', 9, 'bold')
-            )
+            y_offset = 10
+            bar_height = 20
             
-            # Draw size and percentage
-            size_text = f"{self.analyzer.format_bytes(size)} ({percentage:.1f}%)"
-            self.category_canvas.create_text(
-                110 + bar_width, y_offset + bar_height/2,
-                text=size_text,
-                anchor=tk.W,
-                font=('Arial', 9)
-            )
-            
-            y_offset += bar_height + 5
+            for i in self.category_order(categories):
+                size = categories[i]
+                if size == 0:
+                    continue
+                percentage = (size / total) * 100
+                bar_width = (size / total) * (width - 250)
+                rect_id, size_id, label_id = self._bar_ids[i]
+                
+                # Move bar and label
+                canvas.coords(rect_id, 100, y_offset, 100 + bar_width, y_offset + bar_height)
+                canvas.coords(label_id, 5, y_offset + bar_height/2)
+                
+                # Update size and percentage
+                size_text = f"{self.analyzer.format_bytes(size)} ({percentage:.1f}%)"
+                canvas.coords(size_id, 110 + bar_width, y_offset + bar_height/2)
+                canvas.itemconfig(size_id, text=size_text)
+                
+                visible.add(i)
+                y_offset += bar_height + 5
+        
+        self.show_chart_items(canvas, self._bar_ids, self._bars_shown, visible)
     
     def draw_pie_chart(self, results=None):
         """Draw pie chart visualization (camembert)"""
-        import math
-        
-        self.pie_canvas.delete("all")
+        canvas = self.pie_canvas
+        visible = set()
+        in_legend = set()
         
         if not results:
             results = self.current_results
         
-        if not results or results['total_size'] == 0:
-            return
-        
-        categories = results['categories']
-        total = results['total_size']
-        
-        if total == 0:
-            return
-        
-        colors = {
-            'video': '#E91E63',
-            'image': '#2196F3',
-            'pdf': '#f44336',
-            'document': '#4CAF50',
-            'archive': '#FF9800',
-            'audio': '#9C27B0',
-            'code': '#00BCD4',
-            'other': '#757575'
-        }
-        
-        # Pie chart settings
-        center_x = 125
-        center_y = 125
-        radius = 80
-        
-        # Draw pie slices
-        start_angle = 0
-        sorted_cats = sorted(categories.items(), key=lambda x: x[1], reverse=True)
-        
-        for category, size in sorted_cats:
-            if size == 0:
-                continue
-                
-            percentage = size / total
-            extent = percentage * 360
-            
-            color = colors.get(category, '#757575')
+        if results and results['total_size']:
+            categories = results['categories']
+            total = results['total_size']
             
-            # Draw slice
-            self.pie_canvas.create_arc(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                start=start_angle, extent=extent,
-                fill=color, outline='white', width=2
-            )
+            # Update pie slices
+            start_angle = 0
+            order = self.category_order(categories)
             
-            start_angle += extent
-        
-        # Draw legend below pie
-        legend_y = 220
-        legend_x = 10
-        
-        for i, (category, size) in enumerate(sorted_cats[:8]):  # Top 8 categories
-            if size == 0:
-                continue
+            for i in order:
+                size = categories[i]
+                if size == 0:
+                    continue
+                    
+                percentage = size / total
+                extent = percentage * 360
+                canvas.itemconfig(self._pie_ids[i][0], start=start_angle, extent=extent)
                 
-            color = colors.get(category, '#757575')
-            percentage = (size / total) * 100
-            
-            # Draw color box
-            if i < 4:
-                x = legend_x
-                y = legend_y + (i * 20)
-            else:
-                x = legend_x + 125
-                y = legend_y + ((i - 4) * 20)
+                visible.add(i)
+                start_angle += extent
             
-            self.pie_canvas.create_rectangle(
-                x, y, x + 12, y + 12,
-                fill=color, outline=color
-            )
+            # Update legend below pie
+            legend_y = 220
+            legend_x = 10
             
-            # Draw label
-            label = f"{category[:3].upper()} {percentage:.0f}%"
-            self.pie_canvas.create_text(
-                x + 16, y + 6,
-                text=label,
-                anchor=tk.W,
-                font=('Arial', 8)
-            )
+            for rank, i in enumerate(order[:8]):  # Top 8 categories
+                size = categories[i]
+                if size == 0:
+                    continue
+                    
+                percentage = (size / total) * 100
+                
+                # Move color box
+                if rank < 4:
+                    x = legend_x
+                    y = legend_y + (rank * 20)
+                else:
+                    x = legend_x + 125
+                    y = legend_y + ((rank - 4) * 20)
+                
+                box_id, label_id = self._legend_ids[i]
+                canvas.coords(box_id, x, y, x + 12, y + 12)
+                
+                # Update label
+                label = f"{CATEGORY_NAMES[i][:3].upper()} {percentage:.0f}%"
+                canvas.coords(label_id, x + 16, y + 6)
+                canvas.itemconfig(label_id, text=label)
+                
+                in_legend.add(i)
+        
+        self.show_chart_items(canvas, self._pie_ids, self._pie_shown, visible)
+        self.show_chart_items(canvas, self._legend_ids, self._legend_shown, in_legend)
     
     def apply_filter(self):
         """Apply current filter and sort settings"""
         if not self.current_results:
             return
         
-        self.tree.delete(*self.tree.get_children())
+        self.clear_table()
         
-        # Filter items
-        items = self.current_results['all_items']
-        filter_type = self.filter_var.get()
+        # Filter and sort items (limit to 1000 for performance)
+        items, total = self.analyzer.select_items(
+            self.filter_var.get(), self.sort_var.get(), 1000)
         
-        if filter_type == 'files':
-            items = [x for x in items if x['type'] == 'file']
-        elif filter_type == 'folders':
-            items = [x for x in items if x['type'] == 'folder']
-        
-        # Sort items
-        if self.sort_var.get() == 'name':
-            items = sorted(items, key=lambda x: x['name'].lower())
-        else:
-            items = sorted(items, key=lambda x: x['size'], reverse=True)
-        
-        # Populate tree (limit to 1000 for performance)
-        for i, item in enumerate(items[:1000], 1):
-            type_str = item.get('category', item['type']).capitalize()
-            self.tree.insert('', 'end', text=str(i), values=(
-                item['name'],
-                type_str,
-                self.analyzer.format_bytes(item['size']),
-                item['path']
-            ))
-        
-        if len(items) > 1000:
-            self.status_var.set(f"Showing top 1000 of {len(items):,} items")
+        # Populate tree detached from the layout and scrollbar so it redraws once
+        self.tree.configure(yscrollcommand='')
+        self.tree.grid_remove()
+        try:
+            for i, item in enumerate(items, 1):
+                values = self.row_values(item)
+                iid = self.tree.insert('', 'end', text=str(i), values=values)
+                self._displayed_iids[item['path']] = iid
+                self._row_state[iid] = values
+        finally:
+            self.tree.grid()
+            self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
+        
+        if total > 1000:
+            self.status_var.set(f"Showing top 1000 of {total:,} items")
         else:
-            self.status_var.set(f"Showing {len(items):,} items")
+            self.status_var.set(f"Showing {total:,} items")
     
     def show_context_menu(self, event):
         """Show context menu on right-click"""